@@ -1,6 +1,7 @@
 """Support for IntesisHome and airconwithme Smart AC Controllers."""
 import logging
-from random import randrange
+from random import uniform
+from types import MappingProxyType
 
 from pyintesishome import IHAuthenticationError, IHConnectionError, IntesisHome
 import voluptuous as vol
@@ -29,6 +30,7 @@ from homeassistant.const import (
     CONF_USERNAME,
     TEMP_CELSIUS,
 )
+from homeassistant.core import callback
 from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
@@ -49,33 +51,41 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     }
 )
 
-MAP_IH_TO_HVAC_MODE = {
-    "auto": HVAC_MODE_HEAT_COOL,
-    "cool": HVAC_MODE_COOL,
-    "dry": HVAC_MODE_DRY,
-    "fan": HVAC_MODE_FAN_ONLY,
-    "heat": HVAC_MODE_HEAT,
-    "off": HVAC_MODE_OFF,
-}
-
-MAP_HVAC_MODE_TO_IH = {v: k for k, v in MAP_IH_TO_HVAC_MODE.items()}
-
-MAP_STATE_ICONS = {
-    HVAC_MODE_COOL: "mdi:snowflake",
-    HVAC_MODE_DRY: "mdi:water-off",
-    HVAC_MODE_FAN_ONLY: "mdi:fan",
-    HVAC_MODE_HEAT: "mdi:white-balance-sunny",
-    HVAC_MODE_HEAT_COOL: "mdi:cached",
-}
-
-IH_HVAC_MODES = [
+MAP_IH_TO_HVAC_MODE = MappingProxyType(
+    {
+        "auto": HVAC_MODE_HEAT_COOL,
+        "cool": HVAC_MODE_COOL,
+        "dry": HVAC_MODE_DRY,
+        "fan": HVAC_MODE_FAN_ONLY,
+        "heat": HVAC_MODE_HEAT,
+        "off": HVAC_MODE_OFF,
+    }
+)
+
+MAP_HVAC_MODE_TO_IH = MappingProxyType({v: k for k, v in MAP_IH_TO_HVAC_MODE.items()})
+
+MAP_STATE_ICONS = MappingProxyType(
+    {
+        HVAC_MODE_COOL: "mdi:snowflake",
+        HVAC_MODE_DRY: "mdi:water-off",
+        HVAC_MODE_FAN_ONLY: "mdi:fan",
+        HVAC_MODE_HEAT: "mdi:white-balance-sunny",
+        HVAC_MODE_HEAT_COOL: "mdi:cached",
+    }
+)
+
+RECONNECT_DELAY_BASE = 1
+RECONNECT_DELAY_MAX = 600
+RECONNECT_RESET_DELAY = 300
+
+IH_HVAC_MODES = (
     HVAC_MODE_HEAT_COOL,
     HVAC_MODE_COOL,
     HVAC_MODE_HEAT,
     HVAC_MODE_DRY,
     HVAC_MODE_FAN_ONLY,
     HVAC_MODE_OFF,
-]
+)
 
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
@@ -102,13 +112,16 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 
     ih_devices = controller.get_devices()
     if ih_devices:
+        connection = IntesisConnection(hass, controller)
+        await controller.add_update_callback(connection.async_update_callback)
         async_add_entities(
             [
-                IntesisAC(ih_device_id, device, controller)
+                IntesisAC(ih_device_id, device, controller, connection)
                 for ih_device_id, device in ih_devices.items()
             ],
             True,
         )
+        await connection.async_connect()
     else:
         _LOGGER.error(
             "Error getting device list from %s API: %s",
@@ -118,12 +131,129 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         await controller.stop()
 
 
+class IntesisConnection:
+    """Reconnects a controller shared by several devices, with backoff."""
+
+    def __init__(self, hass, controller):
+        """Initialize the connection manager."""
+        self._hass = hass
+        self._controller = controller
+        self._attempt = 0
+        self._cancel_reconnect = None
+        self._cancel_reset = None
+        self._devices = 0
+        self._stopped = False
+
+    async def async_update_callback(self, device_id=None):
+        """Schedule a reconnection when the controller reports a lost connection."""
+        if self._controller.is_connected:
+            # Only reset the backoff once the connection has stayed up
+            if self._attempt and self._cancel_reset is None:
+                self._cancel_reset = async_call_later(
+                    self._hass, RECONNECT_RESET_DELAY, self._async_reset_backoff
+                )
+        elif self._controller.is_disconnected:
+            self._async_cancel_reset()
+            self._async_schedule_reconnect()
+
+    @callback
+    def _async_reset_backoff(self, now):
+        """Reset the backoff after the connection stayed up."""
+        self._cancel_reset = None
+        self._attempt = 0
+
+    @callback
+    def _async_cancel_reset(self):
+        """Cancel a pending backoff reset."""
+        if self._cancel_reset is not None:
+            self._cancel_reset()
+            self._cancel_reset = None
+
+    @callback
+    def _async_schedule_reconnect(self):
+        """Schedule the next reconnection attempt unless one is pending."""
+        if self._stopped or self._cancel_reconnect is not None:
+            return
+
+        delay = min(RECONNECT_DELAY_MAX, RECONNECT_DELAY_BASE * 2 ** self._attempt)
+        delay += uniform(0, delay * 0.1)
+        if delay < RECONNECT_DELAY_MAX:
+            self._attempt += 1
+        _LOGGER.error(
+            "Connection to %s API is down, reconnecting in %i seconds",
+            self._controller.device_type,
+            delay,
+        )
+        self._cancel_reconnect = async_call_later(
+            self._hass, delay, self._async_reconnect
+        )
+
+    async def _async_reconnect(self, now):
+        """Reconnect to the API after the connection was lost."""
+        self._cancel_reconnect = None
+        await self.async_connect()
+
+    async def async_connect(self):
+        """Connect the controller, scheduling a retry if the attempt fails."""
+        try:
+            await self._async_try_connect()
+        except (IHAuthenticationError, IHConnectionError) as ex:
+            _LOGGER.error(
+                "Exception connecting to %s: %s", self._controller.device_type, ex
+            )
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(
+                "Unexpected error connecting to %s", self._controller.device_type
+            )
+
+        # Failed attempts leave the controller idle without a callback
+        if self._controller.is_disconnected:
+            self._async_schedule_reconnect()
+
+    async def _async_try_connect(self):
+        """Fetch an auth token and open the controller connection."""
+        # Fetch the auth token first: connect() would otherwise retry the poll
+        # itself and stay stuck in the connecting state if it fails
+        token = await self._controller.poll_status()
+        if not token or self._stopped:
+            return
+
+        await self._controller.connect()
+        if self._stopped:
+            # The last device was removed while the connection was opening
+            await self._controller.stop()
+
+    @callback
+    def async_register_device(self):
+        """Register a device sharing the controller."""
+        self._devices += 1
+        if self._devices == 1 and self._stopped:
+            # The last device was removed and added again, e.g. on a rename
+            self._stopped = False
+            self._attempt = 0
+            self._hass.async_create_task(self.async_connect())
+
+    async def async_unregister_device(self):
+        """Unregister a device, shutting down the controller after the last one."""
+        self._devices -= 1
+        if self._devices > 0:
+            return
+
+        self._stopped = True
+        self._async_cancel_reset()
+        if self._cancel_reconnect is not None:
+            self._cancel_reconnect()
+            self._cancel_reconnect = None
+        await self._controller.stop()
+
+
 class IntesisAC(ClimateDevice):
     """Represents an Intesishome air conditioning device."""
 
-    def __init__(self, ih_device_id, ih_device, controller):
+    def __init__(self, ih_device_id, ih_device, controller, connection):
         """Initialize the thermostat."""
         self._controller = controller
+        self._connection = connection
         self._device_id = ih_device_id
         self._ih_device = ih_device
         self._device_name = ih_device.get("name")
@@ -161,11 +291,8 @@ class IntesisAC(ClimateDevice):
     async def async_added_to_hass(self):
         """Subscribe to event updates."""
         _LOGGER.debug("Added climate device with state: %s", repr(self._ih_device))
+        self._connection.async_register_device()
         await self._controller.add_update_callback(self.async_update_callback)
-        try:
-            await self._controller.connect()
-        except IHConnectionError as ex:
-            _LOGGER.error("Exception connecting to IntesisHome: %s", ex)
 
     @property
     def name(self):
@@ -204,7 +331,7 @@ class IntesisAC(ClimateDevice):
         hvac_mode = kwargs.get(ATTR_HVAC_MODE)
 
         if hvac_mode:
-            await self.async_set_hvac_mode(hvac_mode)
+            await self._async_set_hvac_mode(hvac_mode)
 
         if temperature:
             _LOGGER.debug("Setting %s to %s degrees", self._device_type, temperature)
@@ -216,12 +343,17 @@ class IntesisAC(ClimateDevice):
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set operation mode."""
+        await self._async_set_hvac_mode(hvac_mode)
+
+        # Write changes to HA, API can be slow to push changes
+        self.async_write_ha_state()
+
+    async def _async_set_hvac_mode(self, hvac_mode):
+        """Send the operation mode to the controller without writing state."""
         _LOGGER.debug("Setting %s to %s mode", self._device_type, hvac_mode)
         if hvac_mode == HVAC_MODE_OFF:
             self._power = False
             await self._controller.set_power_off(self._device_id)
-            # Write changes to HA, API can be slow to push changes
-            self.async_write_ha_state()
             return
 
         # First check device is turned on
@@ -238,7 +370,6 @@ class IntesisAC(ClimateDevice):
 
         # Updates can take longer than 2 seconds, so update locally
         self._hvac_mode = hvac_mode
-        self.async_write_ha_state()
 
     async def async_set_fan_mode(self, fan_mode):
         """Set fan mode (from quiet, low, medium, high, auto)."""
@@ -297,8 +428,8 @@ class IntesisAC(ClimateDevice):
             self._swing = SWING_OFF
 
     async def async_will_remove_from_hass(self):
-        """Shutdown the controller when the device is being removed."""
-        await self._controller.stop()
+        """Shutdown the controller when the last device is being removed."""
+        await self._connection.async_unregister_device()
 
     @property
     def icon(self):
@@ -312,18 +443,8 @@ class IntesisAC(ClimateDevice):
         """Let HA know there has been an update from the controller."""
         # Track changes in connection state
         if not self._controller.is_connected and self._connected:
-            # Connection has dropped
+            # Connection has dropped, IntesisConnection schedules the reconnection
             self._connected = False
-            reconnect_minutes = 1 + randrange(10)
-            _LOGGER.error(
-                "Connection to %s API was lost. Reconnecting in %i minutes",
-                self._device_type,
-                reconnect_minutes,
-            )
-            # Schedule reconnection
-            async_call_later(
-                self.hass, reconnect_minutes * 60, self._controller.connect()
-            )
 
         if self._controller.is_connected and not self._connected:
             # Connection has been restored
@@ -0,0 +1,224 @@
+"""The tests for the IntesisHome climate platform."""
+from asynctest import CoroutineMock, MagicMock, patch
+from pyintesishome import IHConnectionError
+import pytest
+
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.intesishome.climate import (
+    RECONNECT_DELAY_MAX,
+    RECONNECT_RESET_DELAY,
+    IntesisConnection,
+)
+from homeassistant.setup import async_setup_component
+
+CONFIG = {
+    CLIMATE_DOMAIN: {"platform": "intesishome", "username": "user", "password": "pass"}
+}
+
+
+@pytest.fixture(name="controller")
+def controller_fixture():
+    """Return a mocked IntesisHome controller that connects successfully."""
+    controller = MagicMock(device_type="IntesisHome")
+    controller.is_connected = False
+    controller.is_disconnected = True
+
+    def connected():
+        controller.is_connected = True
+        controller.is_disconnected = False
+
+    def disconnected():
+        controller.is_connected = False
+        controller.is_disconnected = True
+
+    controller.poll_status = CoroutineMock(return_value="token")
+    controller.connect = CoroutineMock(side_effect=connected)
+    controller.stop = CoroutineMock(side_effect=disconnected)
+    controller.add_update_callback = CoroutineMock()
+    controller.get_devices.return_value = {
+        "1": {"name": "Living room"},
+        "2": {"name": "Bedroom"},
+    }
+    controller.get_fan_speed_list.return_value = ["auto", "quiet"]
+    controller.get_temperature.return_value = 21.5
+    controller.get_setpoint.return_value = 22
+    controller.get_min_setpoint.return_value = 18
+    controller.get_max_setpoint.return_value = 30
+    controller.get_outdoor_temperature.return_value = None
+    controller.get_fan_speed.return_value = "auto"
+    controller.get_mode.return_value = "heat"
+    controller.get_vertical_swing.return_value = "auto/stop"
+    controller.get_horizontal_swing.return_value = "auto/stop"
+    controller.is_on.return_value = True
+    return controller
+
+
+@pytest.fixture(name="call_later")
+def call_later_fixture():
+    """Capture the timers scheduled by the connection manager."""
+    with patch(
+        "homeassistant.components.intesishome.climate.async_call_later"
+    ) as mock_call_later, patch(
+        "homeassistant.components.intesishome.climate.uniform", return_value=0
+    ):
+        yield mock_call_later
+
+
+def scheduled(call_later, action_name):
+    """Return the delays of the timers scheduled for an action."""
+    return [
+        call[0][1]
+        for call in call_later.call_args_list
+        if call[0][2].__name__ == action_name
+    ]
+
+
+async def fire_last(call_later):
+    """Run the action of the last scheduled timer."""
+    action = call_later.call_args[0][2]
+    result = action(None)
+    if result is not None:
+        await result
+
+
+async def drop_connection(controller, connection):
+    """Simulate the controller reporting a lost connection."""
+    controller.is_connected = False
+    controller.is_disconnected = True
+    await connection.async_update_callback()
+
+
+async def test_setup_connects_once(hass, controller):
+    """Test the platform connects the shared controller once for all devices."""
+    with patch(
+        "homeassistant.components.intesishome.climate.IntesisHome",
+        return_value=controller,
+    ):
+        assert await async_setup_component(hass, CLIMATE_DOMAIN, CONFIG)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room").state == "heat"
+    assert hass.states.get("climate.bedroom").state == "heat"
+    assert controller.connect.call_count == 1
+
+
+async def test_backoff_doubles_up_to_max(hass, controller, call_later):
+    """Test the reconnection delay doubles and is capped."""
+    controller.poll_status.side_effect = IHConnectionError
+    connection = IntesisConnection(hass, controller)
+
+    await connection.async_connect()
+    for _ in range(12):
+        await fire_last(call_later)
+
+    delays = scheduled(call_later, "_async_reconnect")
+    assert delays[:5] == [1, 2, 4, 8, 16]
+    assert delays[-3:] == [RECONNECT_DELAY_MAX] * 3
+    controller.connect.assert_not_called()
+
+
+async def test_failed_poll_reschedules(hass, controller, call_later):
+    """Test unexpected poll errors still schedule the next attempt."""
+    controller.poll_status.side_effect = ValueError
+    connection = IntesisConnection(hass, controller)
+
+    await connection.async_connect()
+    assert scheduled(call_later, "_async_reconnect") == [1]
+
+    controller.poll_status.side_effect = None
+    await fire_last(call_later)
+    assert controller.connect.call_count == 1
+    assert scheduled(call_later, "_async_reconnect") == [1]
+
+
+async def test_failed_socket_open_reschedules(hass, controller, call_later):
+    """Test a connect that leaves the controller idle schedules a retry."""
+    controller.connect.side_effect = None
+    connection = IntesisConnection(hass, controller)
+
+    await connection.async_connect()
+    assert scheduled(call_later, "_async_reconnect") == [1]
+
+
+async def test_no_double_scheduling(hass, controller, call_later):
+    """Test a callback during a failed attempt does not schedule twice."""
+    connection = IntesisConnection(hass, controller)
+
+    async def connect_and_drop():
+        await connection.async_update_callback()
+
+    controller.connect.side_effect = connect_and_drop
+    await connection.async_connect()
+
+    assert scheduled(call_later, "_async_reconnect") == [1]
+
+
+async def test_backoff_resets_after_stable_connection(hass, controller, call_later):
+    """Test the backoff only resets once the connection stayed up."""
+    connection = IntesisConnection(hass, controller)
+    await connection.async_connect()
+
+    await drop_connection(controller, connection)
+    await fire_last(call_later)
+    await connection.async_update_callback()
+    assert scheduled(call_later, "_async_reset_backoff") == [RECONNECT_RESET_DELAY]
+
+    # A drop before the reset window keeps backing off
+    cancel_reset = call_later.return_value
+    await drop_connection(controller, connection)
+    cancel_reset.assert_called_once_with()
+    await fire_last(call_later)
+    assert scheduled(call_later, "_async_reconnect") == [1, 2]
+
+    await connection.async_update_callback()
+    await fire_last(call_later)
+    await drop_connection(controller, connection)
+    assert scheduled(call_later, "_async_reconnect") == [1, 2, 1]
+
+
+async def test_stop_after_last_device(hass, controller, call_later):
+    """Test the controller stops only when the last device is removed."""
+    connection = IntesisConnection(hass, controller)
+    connection.async_register_device()
+    connection.async_register_device()
+    await connection.async_connect()
+
+    await connection.async_unregister_device()
+    controller.stop.assert_not_called()
+
+    await connection.async_unregister_device()
+    controller.stop.assert_called_once_with()
+
+    await connection.async_update_callback()
+    assert scheduled(call_later, "_async_reconnect") == []
+
+
+async def test_no_connect_after_stop_during_poll(hass, controller, call_later):
+    """Test removing the last device during a poll does not open a socket."""
+    connection = IntesisConnection(hass, controller)
+    connection.async_register_device()
+
+    async def poll_and_remove():
+        await connection.async_unregister_device()
+        return "token"
+
+    controller.poll_status.side_effect = poll_and_remove
+    await connection.async_connect()
+
+    controller.connect.assert_not_called()
+    assert scheduled(call_later, "_async_reconnect") == []
+
+
+async def test_readd_last_device_reconnects(hass, controller, call_later):
+    """Test removing and adding back the last device, as on a rename."""
+    connection = IntesisConnection(hass, controller)
+    connection.async_register_device()
+    await connection.async_connect()
+
+    await connection.async_unregister_device()
+    connection.async_register_device()
+    await hass.async_block_till_done()
+    assert controller.connect.call_count == 2
+
+    await drop_connection(controller, connection)
+    assert scheduled(call_later, "_async_reconnect") == [1]